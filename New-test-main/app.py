@@ -1,28 +1,87 @@
 from __future__ import annotations
 
-import datetime
+import atexit
+import multiprocessing
+import os
+import re
 import sqlite3
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass, field
+from functools import lru_cache, partial
 from pathlib import Path
-from threading import Thread
-from typing import List, Optional
+from queue import Empty, Queue
+from threading import Lock
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    ContextManager,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+)
+
+import orjson
+from flask import Flask, g, has_app_context, jsonify, render_template, request
+from flask.json.provider import JSONProvider
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Browser, BrowserContext, Playwright
+
+
+class OrjsonProvider(JSONProvider):
+    """
+    jsonify/get_json über orjson. orjson serialisiert Dataclasses selbst,
+    Views können Message & Co. also ohne asdict() zurückgeben.
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype="application/json")
 
-from flask import Flask, jsonify, render_template, request
-from playwright.sync_api import sync_playwright
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 BASE_DIR = Path(__file__).parent
 DATA_DIR = BASE_DIR / "data"
 PROFILE_DIR = DATA_DIR / "profiles"
 DB_PATH = DATA_DIR / "accounts.db"
 LOGIN_URL = "https://www.kleinanzeigen.de/m-benutzer-anmeldung-inapp.html?appType=MWEB"
+# Cookie-Namen, die auf eine bestehende Sitzung hindeuten (Teilstring, klein geschrieben).
+AUTH_COOKIE_RE = re.compile(r"session|sid|auth|token")
+# Bei Schemaänderungen erhöhen, damit init_db() die Migrationen erneut ausführt.
+SCHEMA_VERSION = 4
 
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 PROFILE_DIR.mkdir(parents=True, exist_ok=True)
 
 
-@dataclass
+@lru_cache(maxsize=2)
+def _format_minute(minute: int, fmt: str) -> str:
+    return time.strftime(fmt, time.localtime(minute * 60))
+
+
+def now_minute() -> str:
+    """Aktuelle Ortszeit als "YYYY-MM-DD HH:MM", pro Minute nur einmal formatiert."""
+    return _format_minute(int(time.time() // 60), "%Y-%m-%d %H:%M")
+
+
+def now_minute_iso() -> str:
+    """Wie now_minute, aber im ISO-Format "YYYY-MM-DDTHH:MM" (accounts.created_at)."""
+    return _format_minute(int(time.time() // 60), "%Y-%m-%dT%H:%M")
+
+
+@dataclass(slots=True)
 class Account:
     id: int
     name: str
@@ -36,7 +95,7 @@ class Account:
     password: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class LoginJob:
     id: int
     email: str
@@ -52,21 +111,204 @@ class LoginJob:
     account_id: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     account_id: int
     listing_title: str
     sender: str
     text: str
-    timestamp: str = field(
-        default_factory=lambda: datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
-    )
+    timestamp: str = field(default_factory=now_minute)
+
+
+class ConnectionPool:
+    """
+    Hält langlebige SQLite-Verbindungen, damit nicht jeder Request neu verbindet.
+    Verbindungen werden bei Bedarf bis zur Poolgröße angelegt und danach geteilt.
+    """
+
+    def __init__(
+        self, path: Path, max_connections: int = 16, timeout: float = 10.0
+    ) -> None:
+        self._path = path
+        self._size = max_connections
+        self._timeout = timeout
+        self._idle: Queue[sqlite3.Connection] = Queue(maxsize=self._size)
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = Lock()
+        self._wal_enabled = False
+        self._pid = os.getpid()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Verbindungen leben so lange wie der Pool: alle Statements der App bleiben
+        # vorbereitet im Statement-Cache (Schlüssel ist der SQL-Text).
+        connection = sqlite3.connect(
+            self._path, check_same_thread=False, cached_statements=256
+        )
+        connection.row_factory = sqlite3.Row
+        # journal_mode wird in der Datenbankdatei gespeichert → einmal pro Pool reicht.
+        if not self._wal_enabled:
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._wal_enabled = True
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA temp_store=MEMORY")
+        connection.execute("PRAGMA mmap_size=268435456")
+        connection.execute("PRAGMA cache_size=-20000")
+        connection.execute("PRAGMA foreign_keys=ON")
+        return connection
+
+    def _forget_inherited(self) -> None:
+        # SQLite-Verbindungen dürfen nicht über fork() hinweg benutzt werden
+        # (z. B. gunicorn --preload): geerbte Verbindungen verwerfen, neu aufbauen.
+        self._idle = Queue(maxsize=self._size)
+        self._connections = []
+        self._lock = Lock()
+        self._pid = os.getpid()
+
+    def get_connection(self) -> sqlite3.Connection:
+        """Leiht eine Verbindung aus; Rückgabe über put_connection()."""
+        if self._pid != os.getpid():
+            self._forget_inherited()
+        try:
+            return self._idle.get_nowait()
+        except Empty:
+            pass
+        with self._lock:
+            if len(self._connections) < self._size:
+                connection = self._connect()
+                self._connections.append(connection)
+                return connection
+        try:
+            return self._idle.get(timeout=self._timeout)
+        except Empty:
+            raise sqlite3.OperationalError(
+                f"no database connection free after {self._timeout:g}s"
+            ) from None
+
+    def put_connection(self, connection: sqlite3.Connection) -> None:
+        if connection.in_transaction:
+            connection.rollback()
+        self._idle.put(connection)
+
+    def warm(self, count: int) -> None:
+        """Legt vorab Verbindungen an, bis der Pool ``count`` Stück hält."""
+        if self._pid != os.getpid():
+            self._forget_inherited()
+        with self._lock:
+            while len(self._connections) < min(count, self._size):
+                connection = self._connect()
+                self._connections.append(connection)
+                self._idle.put(connection)
+
+    @contextmanager
+    def acquire(self) -> Iterator[sqlite3.Connection]:
+        connection = self.get_connection()
+        try:
+            # Wie ``with sqlite3.connect(...)``: Commit bei Erfolg, sonst Rollback.
+            with connection:
+                yield connection
+        finally:
+            self.put_connection(connection)
+
+    def close_all(self) -> None:
+        if self._pid != os.getpid():
+            return
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+            while True:
+                try:
+                    self._idle.get_nowait()
+                except Empty:
+                    break
+
+
+# Ein Request hält seine Verbindung bis zum Teardown: die Poolgröße muss daher zur
+# Zahl gleichzeitiger Requests passen, nicht zur Zahl der CPUs.
+DB_POOL_SIZE = 16
+DB_POOL_TIMEOUT = 10.0
+
+pool = ConnectionPool(DB_PATH, max_connections=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT)
+atexit.register(pool.close_all)
+
+
+@contextmanager
+def get_connection() -> Iterator[sqlite3.Connection]:
+    """
+    Innerhalb eines Requests: eine Verbindung für den ganzen Request, die erst in
+    teardown_appcontext zurück in den Pool geht. Sonst (Worker-Prozesse, Callbacks)
+    direkt aus dem Pool.
+    """
+    if not has_app_context():
+        with pool.acquire() as connection:
+            yield connection
+        return
+
+    if "db" not in g:
+        g.db = pool.get_connection()
+    with g.db:
+        yield g.db
+
+
+@app.teardown_appcontext
+def release_connection(exception: Optional[BaseException]) -> None:
+    connection = g.pop("db", None)
+    if connection is not None:
+        pool.put_connection(connection)
+
+
+T = TypeVar("T")
+
+
+class ReadCache:
+    """
+    Ein zwischengespeicherter Wert mit Ablaufzeit und optionalem Schlüssel.
+    Das Lock schützt nur den Eintrag; geladen wird außerhalb, damit ein Cache-Miss
+    weder andere Leser noch die Verbindungs-Pool-Wartenden blockiert. Wurde während
+    des Ladens invalidiert, wird das (evtl. veraltete) Ergebnis nicht gespeichert.
+    """
+
+    def __init__(self, ttl: Optional[float] = None) -> None:
+        self._ttl = ttl
+        self._lock = Lock()
+        self._entry: Optional[tuple[float, object, object]] = None
+        self._generation = 0
+
+    def get(self, load: Callable[[], T], key: object = None) -> T:
+        with self._lock:
+            entry, generation = self._entry, self._generation
+        if entry is not None and entry[0] > time.monotonic() and entry[1] == key:
+            return entry[2]
 
+        value = load()
+        expires = float("inf") if self._ttl is None else time.monotonic() + self._ttl
+        with self._lock:
+            if self._generation == generation:
+                self._entry = (expires, key, value)
+        return value
 
-def get_connection() -> sqlite3.Connection:
-    connection = sqlite3.connect(DB_PATH)
-    connection.row_factory = sqlite3.Row
-    return connection
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entry = None
+            self._generation += 1
+
+
+# Lese-Caches für die Übersicht; werden bei jedem Schreibzugriff verworfen und
+# laufen spätestens nach CACHE_TTL Sekunden ab (Schreibzugriffe anderer Prozesse,
+# age_days nach Mitternacht). Das JSON von /api/messages gilt je ETag.
+CACHE_TTL = 5.0
+_accounts_cache = ReadCache(CACHE_TTL)
+_conversations_cache = ReadCache(CACHE_TTL)
+_messages_json_cache = ReadCache()
+
+
+def invalidate_accounts() -> None:
+    _accounts_cache.invalidate()
+
+
+def invalidate_messages() -> None:
+    _conversations_cache.invalidate()
+    _messages_json_cache.invalidate()
 
 
 def build_profile_path(account_id: int) -> str:
@@ -74,7 +316,17 @@ def build_profile_path(account_id: int) -> str:
 
 
 def init_db() -> None:
+    pool.warm(2)
     with get_connection() as connection:
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+
+        connection.execute("BEGIN IMMEDIATE")
+        # Ein anderer Prozess kann zwischen Prüfung und Schreibsperre migriert haben.
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
         connection.execute(
             """
             CREATE TABLE IF NOT EXISTS accounts (
@@ -103,6 +355,12 @@ def init_db() -> None:
             );
             """
         )
+        # Ersetzt den alten einspaltigen Index idx_messages_account.
+        connection.execute("DROP INDEX IF EXISTS idx_messages_account")
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_messages_account_timestamp"
+            " ON messages(account_id, timestamp)"
+        )
         connection.execute(
             """
             CREATE TABLE IF NOT EXISTS login_jobs (
@@ -153,45 +411,48 @@ def init_db() -> None:
                     f"ALTER TABLE login_jobs ADD COLUMN {column_name} {sql_type}"
                 )
 
-        # --- backfill derived columns for accounts ---
-        rows = connection.execute(
-            "SELECT id, age_days, created_at, profile_path FROM accounts"
-        ).fetchall()
-        now = datetime.datetime.now()
-        for row in rows:
-            updates = {}
-            if not row["created_at"]:
-                created_at = now - datetime.timedelta(days=int(row["age_days"] or 0))
-                updates["created_at"] = created_at.isoformat(timespec="minutes")
-            if not row["profile_path"]:
-                updates["profile_path"] = build_profile_path(int(row["id"]))
-            if updates:
-                connection.execute(
-                    """
-                    UPDATE accounts
-                    SET created_at = COALESCE(?, created_at),
-                        profile_path = COALESCE(?, profile_path)
-                    WHERE id = ?
-                    """,
-                    (
-                        updates.get("created_at"),
-                        updates.get("profile_path"),
-                        row["id"],
-                    ),
-                )
+        # --- backfill derived columns for accounts (set-based, one statement) ---
+        connection.execute(
+            """
+            UPDATE accounts
+            SET created_at = COALESCE(
+                    NULLIF(created_at, ''),
+                    strftime(
+                        '%Y-%m-%dT%H:%M', 'now', 'localtime',
+                        '-' || COALESCE(age_days, 0) || ' days'
+                    )
+                ),
+                profile_path = COALESCE(NULLIF(profile_path, ''), :profile_prefix || id)
+            WHERE created_at IS NULL OR created_at = ''
+               OR profile_path IS NULL OR profile_path = ''
+            """,
+            {"profile_prefix": str(PROFILE_DIR / "account_")},
+        )
+        # Ältere Zeilen haben "YYYY-MM-DD HH:MM"; neue schreiben ISO wie now_minute_iso().
+        connection.execute(
+            """
+            UPDATE accounts
+            SET created_at = REPLACE(created_at, ' ', 'T')
+            WHERE created_at LIKE '____-__-__ __:__'
+            """
+        )
 
+        connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
         connection.commit()
+    invalidate_accounts()
 
 
 def create_login_job(email: str, password: str, proxy: str) -> int:
-    started_at = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
+    started_at = now_minute()
     ios_profile = "iPhone 13"
     with get_connection() as connection:
-        cursor = connection.execute(
+        # profile_path bleibt NULL und wird beim Laden aus der ID abgeleitet.
+        row = connection.execute(
             """
             INSERT INTO login_jobs
-                (account_id, status, started_at, email, password, proxy, ios_profile, profile_path)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                (account_id, status, started_at, email, password, proxy, ios_profile)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            RETURNING id
             """,
             (
                 0,
@@ -201,74 +462,152 @@ def create_login_job(email: str, password: str, proxy: str) -> int:
                 password,
                 proxy,
                 ios_profile,
-                "",
             ),
-        )
-        job_id = int(cursor.lastrowid)
-        profile_path = build_profile_path(job_id)
-        connection.execute(
-            "UPDATE login_jobs SET profile_path = ? WHERE id = ?",
-            (profile_path, job_id),
-        )
+        ).fetchone()
         connection.commit()
-    return job_id
+    return int(row["id"])
+
+
+def load_login_job(connection: sqlite3.Connection, job_id: int) -> Optional[LoginJob]:
+    row = connection.execute(
+        """
+        SELECT id, email, password, proxy, ios_profile, profile_path,
+               status, started_at, finished_at, checked_at, valid, account_id
+        FROM login_jobs WHERE id = ?
+        """,
+        (job_id,),
+    ).fetchone()
+    if row is None:
+        return None
+    job = LoginJob(*row)
+    job.profile_path = job.profile_path or build_profile_path(job.id)
+    return job
 
 
 def fetch_login_job(job_id: int) -> Optional[LoginJob]:
     with get_connection() as connection:
-        row = connection.execute(
-            "SELECT * FROM login_jobs WHERE id = ?", (job_id,)
-        ).fetchone()
-    if row is None:
-        return None
-    return LoginJob(**dict(row))
+        return load_login_job(connection, job_id)
 
 
-def row_to_account(row: sqlite3.Row) -> Account:
-    data = dict(row)
-    created_at = data.get("created_at")
-    if created_at:
-        try:
-            created = datetime.datetime.fromisoformat(created_at)
-            data["age_days"] = max((datetime.datetime.now() - created).days, 0)
-        except ValueError:
-            try:
-                created = datetime.datetime.strptime(created_at, "%Y-%m-%d %H:%M")
-                data["age_days"] = max((datetime.datetime.now() - created).days, 0)
-            except ValueError:
-                data["age_days"] = int(data.get("age_days") or 0)
-    else:
-        data["age_days"] = int(data.get("age_days") or 0)
+def fetch_accounts() -> List[Account]:
+    return _accounts_cache.get(_load_accounts)
 
-    if not data.get("profile_path"):
-        data["profile_path"] = build_profile_path(int(data["id"]))
-    return Account(**data)
 
+def _load_accounts() -> List[Account]:
+    with get_connection() as connection:
+        # Spalten in Feldreihenfolge von Account → positionaler Konstruktor.
+        # age_days wird aus created_at berechnet; ist das Datum nicht lesbar,
+        # bleibt der gespeicherte Wert. Fehlender Profilpfad wie build_profile_path.
+        # Direkt über den Cursor iterieren: keine Zwischenliste aller Zeilen.
+        cursor = connection.execute(
+            """
+            SELECT id, name, email,
+                   COALESCE(
+                       MAX(CAST(julianday('now', 'localtime')
+                                - julianday(created_at) AS INTEGER), 0),
+                       age_days,
+                       0
+                   ) AS age_days,
+                   proxy, ios_profile,
+                   COALESCE(NULLIF(profile_path, ''), :profile_prefix || id),
+                   notes, created_at
+            FROM accounts ORDER BY id
+            """,
+            {"profile_prefix": str(PROFILE_DIR / "account_")},
+        )
+        return [Account(*row) for row in cursor]
 
-def fetch_accounts() -> List[Account]:
+
+def fetch_conversations() -> List[Message]:
+    """
+    Letzte Nachricht je Account für die Chat-Liste. Die Unterhaltungen selbst lädt
+    das Dashboard erst bei Auswahl über /api/messages?account_id=….
+    """
+    return _conversations_cache.get(_load_conversations)
+
+
+def _load_conversations() -> List[Message]:
     with get_connection() as connection:
-        rows = connection.execute("SELECT * FROM accounts ORDER BY id").fetchall()
-    return [row_to_account(row) for row in rows]
+        cursor = connection.execute(
+            """
+            SELECT account_id, listing_title, sender, text, timestamp
+            FROM messages
+            WHERE id IN (SELECT MAX(id) FROM messages GROUP BY account_id)
+            ORDER BY account_id
+            """
+        )
+        return [Message(*row) for row in cursor]
 
 
-def fetch_messages() -> List[Message]:
+def fetch_messages_raw(account_id: Optional[int] = None) -> List[dict]:
     with get_connection() as connection:
-        rows = connection.execute(
-            "SELECT account_id, listing_title, sender, text, timestamp FROM messages"
-        ).fetchall()
-    return [Message(**dict(row)) for row in rows]
+        if account_id is None:
+            cursor = connection.execute(
+                "SELECT account_id, listing_title, sender, text, timestamp FROM messages"
+            )
+        else:
+            cursor = connection.execute(
+                """
+                SELECT account_id, listing_title, sender, text, timestamp
+                FROM messages
+                WHERE account_id = ?
+                ORDER BY timestamp
+                """,
+                (account_id,),
+            )
+        return [dict(row) for row in cursor]
 
 
-def update_login_job(
-    job_id: int,
-    status: str,
-    finished_at: Optional[str] = None,
-    checked_at: Optional[str] = None,
-    valid: Optional[int] = None,
-    account_id: Optional[int] = None,
-) -> None:
+def fetch_messages_etag(account_id: Optional[int] = None) -> str:
+    """
+    Versionsstempel der Nachrichten. Nachrichten werden nur angehängt, daher
+    ändern sich Anzahl bzw. höchste ID bei jedem neuen Eintrag.
+    """
     with get_connection() as connection:
-        connection.execute(
+        if account_id is None:
+            count, max_id = connection.execute(
+                "SELECT COUNT(*), MAX(id) FROM messages"
+            ).fetchone()
+        else:
+            count, max_id = connection.execute(
+                "SELECT COUNT(*), MAX(id) FROM messages WHERE account_id = ?",
+                (account_id,),
+            ).fetchone()
+            return f"{account_id}-{count}-{max_id or 0}"
+    return f"{count}-{max_id or 0}"
+
+
+def fetch_messages_json(etag: str) -> bytes:
+    """
+    JSON für /api/messages direkt aus den Zeilen, ohne Message-Objekte.
+    Der Cache gilt nur für den Stand ``etag`` – so fallen auch Nachrichten auf,
+    die ein anderer Prozess geschrieben hat.
+    """
+    return _messages_json_cache.get(
+        lambda: orjson.dumps(fetch_messages_raw()), key=etag
+    )
+
+
+class LoginJobTracker:
+    """
+    Schreibt alle Statuswechsel eines Login-Jobs über eine einzige Verbindung,
+    die für die gesamte Laufzeit des Logins gehalten wird.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, job_id: int) -> None:
+        self.connection = connection
+        self.job_id = job_id
+        self.job = load_login_job(connection, job_id)
+
+    def mark(
+        self,
+        status: str,
+        finished_at: Optional[str] = None,
+        checked_at: Optional[str] = None,
+        valid: Optional[int] = None,
+        account_id: Optional[int] = None,
+    ) -> None:
+        self.connection.execute(
             """
             UPDATE login_jobs
             SET status = ?,
@@ -278,33 +617,125 @@ def update_login_job(
                 account_id = COALESCE(?, account_id)
             WHERE id = ?
             """,
-            (status, finished_at, checked_at, valid, account_id, job_id),
+            (status, finished_at, checked_at, valid, account_id, self.job_id),
         )
-        connection.commit()
+        # Das Frontend pollt den Status, daher jeden Wechsel sofort committen.
+        self.connection.commit()
 
 
-def check_login_valid(job: LoginJob) -> bool:
-    profile_path = Path(job.profile_path)
-    profile_path.mkdir(parents=True, exist_ok=True)
+@contextmanager
+def track_login_job(job_id: int) -> Iterator[LoginJobTracker]:
+    with get_connection() as connection:
+        yield LoginJobTracker(connection, job_id)
+
+
+def update_login_job(
+    job_id: int,
+    status: str,
+    finished_at: Optional[str] = None,
+    checked_at: Optional[str] = None,
+    valid: Optional[int] = None,
+    account_id: Optional[int] = None,
+) -> None:
+    with track_login_job(job_id) as tracker:
+        tracker.mark(status, finished_at, checked_at, valid, account_id)
 
-    with sync_playwright() as playwright:
-        device = dict(
-            playwright.devices.get(job.ios_profile) or playwright.devices["iPhone 13"]
-        )
-        device.pop("default_browser_type", None)
-
-        context = playwright.webkit.launch_persistent_context(
-            user_data_dir=str(profile_path),
-            proxy={"server": job.proxy} if job.proxy else None,
-            locale="de-DE",
-            headless=True,
-            **device,
-        )
 
+class BrowserHost:
+    """
+    Playwright-Treiber und WebKit-Browser eines Login-Worker-Prozesses.
+    Beides wird beim ersten Login gestartet und für alle weiteren wiederverwendet.
+    Pro Profil gibt es einen Browser-Kontext, den Login und Prüfung gemeinsam nutzen.
+    """
+
+    def __init__(self) -> None:
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._contexts: dict[str, BrowserContext] = {}
+
+    @property
+    def playwright(self) -> Playwright:
+        if self._playwright is None:
+            # Erst hier importieren: Flask-Worker, die nie einen Login starten,
+            # laden Playwright gar nicht.
+            from playwright.sync_api import sync_playwright
+
+            self._playwright = sync_playwright().start()
+        return self._playwright
+
+    @property
+    def browser(self) -> Browser:
+        if self._browser is None or not self._browser.is_connected():
+            self._contexts.clear()
+            self._browser = self.playwright.webkit.launch(headless=False)
+        return self._browser
+
+    def context(self, job: LoginJob) -> BrowserContext:
+        context = self._contexts.get(job.profile_path)
+        if context is None:
+            context = self.browser.new_context(**build_context_options(job))
+            self._contexts[job.profile_path] = context
+        return context
+
+    def close_context(self, profile_path: str) -> None:
+        """Sichert Cookies/localStorage als state.json und schließt den Kontext."""
+        context = self._contexts.pop(profile_path, None)
+        if context is None:
+            return
+        try:
+            context.storage_state(path=build_state_path(profile_path))
+        finally:
+            context.close()
+
+
+browser_host = BrowserHost()
+
+
+@lru_cache(maxsize=None)
+def get_device(name: str) -> dict:
+    """
+    Kontext-Optionen eines Geräts aus dem Playwright-Katalog, unbekannte Namen fallen
+    auf "iPhone 13" zurück. Pro Prozess und Name nur einmal aufgelöst.
+    """
+    devices = browser_host.playwright.devices
+    descriptor = devices.get(name) or devices["iPhone 13"]
+    return {
+        key: value for key, value in descriptor.items() if key != "default_browser_type"
+    }
+
+
+# Plätze für die rechenintensive Phase (Browser-/Kontextstart, Navigation, Prüfung),
+# geteilt über alle Login-Worker-Prozesse. Das Warten auf den User belegt keinen Platz.
+compute_slots: ContextManager = nullcontext()
+
+
+def init_login_worker(slots: ContextManager) -> None:
+    global compute_slots
+    compute_slots = slots
+
+
+def build_state_path(profile_path: str) -> Path:
+    return Path(profile_path) / "state.json"
+
+
+def build_context_options(job: LoginJob) -> dict:
+    state_path = build_state_path(job.profile_path)
+    return {
+        "storage_state": str(state_path) if state_path.exists() else None,
+        "proxy": {"server": job.proxy} if job.proxy else None,
+        "locale": "de-DE",
+        **get_device(job.ios_profile),
+    }
+
+
+def check_login_valid(job: LoginJob) -> bool:
+    # Gleicher Kontext wie beim Login: Cookies liegen schon vor, kein zweiter Browser.
+    context = browser_host.context(job)
+    page = context.new_page()
+    try:
         # In der Check-Phase lieber *nicht* unendlich warten:
-        context.set_default_timeout(30000)
+        page.set_default_timeout(30000)
 
-        page = context.new_page()
         page.goto(LOGIN_URL, wait_until="domcontentloaded", timeout=30000)
 
         current_url = page.url
@@ -324,140 +755,206 @@ def check_login_valid(job: LoginJob) -> bool:
                 cookie.get("name", "").lower()
                 for cookie in storage.get("cookies", [])
             }
-            is_logged_in = any(
-                token in name
-                for name in cookie_names
-                for token in ("session", "sid", "auth", "token")
-            )
-
-        context.close()
+            is_logged_in = any(AUTH_COOKIE_RE.search(name) for name in cookie_names)
+    finally:
+        page.close()
 
     return bool(is_logged_in)
 
 
+def finish_login(job: LoginJob, tracker: LoginJobTracker) -> None:
+    tracker.mark("checking", now_minute())
+
+    try:
+        with compute_slots:
+            is_valid = check_login_valid(job)
+    except Exception:
+        checked_at = now_minute()
+        tracker.mark(
+            "error",
+            finished_at=checked_at,
+            checked_at=checked_at,
+        )
+        return
+
+    checked_at = now_minute()
+
+    if is_valid:
+        created_at = now_minute_iso()
+        account_name = job.email.split("@")[0] if "@" in job.email else job.email
+        cursor = tracker.connection.execute(
+            """
+            INSERT INTO accounts
+                (name, email, age_days, proxy, ios_profile, profile_path, notes, created_at, password)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                account_name,
+                job.email,
+                0,
+                job.proxy,
+                job.ios_profile,
+                job.profile_path,
+                "",
+                created_at,
+                job.password,
+            ),
+        )
+        account_id = int(cursor.lastrowid)
+
+        # Kein Commit dazwischen: INSERT und Statuswechsel landen in derselben
+        # Transaktion, die mark() committet. Ein Job zeigt nie auf ein fehlendes Konto.
+        tracker.mark(
+            "valid",
+            finished_at=checked_at,
+            checked_at=checked_at,
+            valid=1,
+            account_id=account_id,
+        )
+        # Kein invalidate_accounts() hier: dieser Worker-Prozess hat keinen eigenen
+        # Account-Cache, den verwirft der Flask-Prozess in _on_login_done.
+    else:
+        tracker.mark(
+            "invalid",
+            finished_at=checked_at,
+            checked_at=checked_at,
+            valid=0,
+        )
+
+
 def login_with_playwright(job_id: int) -> None:
     """
-    Startet eine persistente WebKit Session (iOS Device Settings) mit Proxy.
-    Human-in-the-loop: Fenster bleibt offen, damit der User manuell einloggen kann.
+    Läuft in einem Login-Worker-Prozess: öffnet ein WebKit-Fenster (iOS Device Settings)
+    mit Proxy. Human-in-the-loop: Fenster bleibt offen, damit der User manuell einloggen kann.
     """
-    job = fetch_login_job(job_id)
-    if job is None:
-        return
+    with track_login_job(job_id) as tracker:
+        job = tracker.job
+        if job is None:
+            return
 
-    profile_path = Path(job.profile_path or build_profile_path(job.id))
-    profile_path.mkdir(parents=True, exist_ok=True)
+        Path(job.profile_path).mkdir(parents=True, exist_ok=True)
 
-    try:
-        with sync_playwright() as playwright:
-            device = dict(
-                playwright.devices.get(job.ios_profile) or playwright.devices["iPhone 13"]
-            )
-            device.pop("default_browser_type", None)
-
-            context = playwright.webkit.launch_persistent_context(
-                user_data_dir=str(profile_path),
-                proxy={"server": job.proxy} if job.proxy else None,
-                locale="de-DE",
-                headless=False,
-                **device,
-            )
+        try:
+            with compute_slots:
+                context = browser_host.context(job)
+                page = context.new_page()
+                # Navigation mit festem Timeout: ein hängender Proxy darf keinen der
+                # geteilten Plätze auf Dauer blockieren.
+                page.goto(LOGIN_URL, wait_until="domcontentloaded", timeout=60000)
+                if "registrierung" in page.url or "registrieren" in page.url:
+                    page.goto(LOGIN_URL, wait_until="domcontentloaded", timeout=60000)
+
+            # Für den manuellen Login (außerhalb der Plätze): unendliche Timeouts ok
+            page.set_default_timeout(0)
+            tracker.mark("waiting_for_user")
 
-            # Für den manuellen Login: unendliche Timeouts ok
-            context.set_default_timeout(0)
+            # Warten bis der User das Fenster schließt (timeout=0 = kein Timeout)
+            page.wait_for_event("close", timeout=0)
 
-            page = context.new_page()
-            page.goto(LOGIN_URL, wait_until="domcontentloaded")
-            if "registrierung" in page.url or "registrieren" in page.url:
-                page.goto(LOGIN_URL, wait_until="domcontentloaded")
+        finally:
+            try:
+                finish_login(job, tracker)
+            finally:
+                browser_host.close_context(job.profile_path)
 
-            update_login_job(job.id, "waiting_for_user")
 
-            # Warten bis der User das Fenster schließt (timeout=0 = kein Timeout)
-            context.wait_for_event("close", timeout=0)
+# Gleichzeitig offene Login-Fenster; die meisten Worker warten nur auf den User.
+LOGIN_WORKERS = 16
+LOGIN_COMPUTE_SLOTS = os.cpu_count() or 2
 
-    finally:
-        update_login_job(
-            job.id,
-            "checking",
-            datetime.datetime.now().strftime("%Y-%m-%d %H:%M"),
-        )
+_login_executor: Optional[ProcessPoolExecutor] = None
+_login_executor_lock = Lock()
 
-        try:
-            is_valid = check_login_valid(job)
-        except Exception:
-            checked_at = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
-            update_login_job(
-                job.id,
-                "error",
-                finished_at=checked_at,
-                checked_at=checked_at,
-            )
-            return
 
-        checked_at = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
-
-        if is_valid:
-            created_at = datetime.datetime.now().isoformat(timespec="minutes")
-            account_name = job.email.split("@")[0] if "@" in job.email else job.email
-            with get_connection() as connection:
-                cursor = connection.execute(
-                    """
-                    INSERT INTO accounts
-                        (name, email, age_days, proxy, ios_profile, profile_path, notes, created_at, password)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        account_name,
-                        job.email,
-                        0,
-                        job.proxy,
-                        job.ios_profile,
-                        job.profile_path,
-                        "",
-                        created_at,
-                        job.password,
-                    ),
-                )
-                account_id = int(cursor.lastrowid)
-                connection.commit()
-
-            update_login_job(
-                job.id,
-                "valid",
-                finished_at=checked_at,
-                checked_at=checked_at,
-                valid=1,
-                account_id=account_id,
-            )
-        else:
-            update_login_job(
-                job.id,
-                "invalid",
-                finished_at=checked_at,
-                checked_at=checked_at,
-                valid=0,
+def get_login_executor(reset: bool = False) -> ProcessPoolExecutor:
+    """
+    Prozesspool für Logins, erst beim ersten Login erzeugt. Jeder Login läuft in einem
+    eigenen Prozess: kein GIL-Wettbewerb und ein abstürzender Browser reißt Flask nicht mit.
+    """
+    global _login_executor
+    with _login_executor_lock:
+        if reset and _login_executor is not None:
+            _login_executor.shutdown(wait=False, cancel_futures=True)
+            _login_executor = None
+        if _login_executor is None:
+            mp_context = multiprocessing.get_context("spawn")
+            _login_executor = ProcessPoolExecutor(
+                max_workers=LOGIN_WORKERS,
+                mp_context=mp_context,
+                initializer=init_login_worker,
+                initargs=(mp_context.BoundedSemaphore(LOGIN_COMPUTE_SLOTS),),
             )
+            atexit.register(_login_executor.shutdown, wait=False, cancel_futures=True)
+        return _login_executor
 
 
-def start_login_thread(job_id: int) -> None:
-    Thread(target=login_with_playwright, args=(job_id,), daemon=True).start()
+def _on_login_done(job_id: int, future: Future) -> None:
+    # Der Account wurde im Worker-Prozess angelegt, der Cache liegt aber hier.
+    invalidate_accounts()
+    if future.cancelled() or future.exception() is None:
+        return
+    app.logger.error("Login-Worker fehlgeschlagen", exc_info=future.exception())
+    if isinstance(future.exception(), BrokenProcessPool):
+        # Prozess ist abgestürzt, bevor finish_login() den Status setzen konnte.
+        finished_at = now_minute()
+        update_login_job(job_id, "error", finished_at=finished_at)
+
+
+def submit_login(job_id: int) -> None:
+    try:
+        future = get_login_executor().submit(login_with_playwright, job_id)
+    except BrokenProcessPool:
+        future = get_login_executor(reset=True).submit(login_with_playwright, job_id)
+    future.add_done_callback(partial(_on_login_done, job_id))
+
+
+_db_ready = False
+_db_ready_lock = Lock()
+
+
+@app.before_request
+def ensure_db() -> None:
+    """Initialisiert die Datenbank einmal pro Prozess, direkt vor dem ersten Request."""
+    global _db_ready
+    if _db_ready:
+        return
+    with _db_ready_lock:
+        if not _db_ready:
+            init_db()
+            _db_ready = True
 
 
 @app.get("/")
 def index() -> str:
     accounts = fetch_accounts()
-    messages = fetch_messages()
+    conversations = fetch_conversations()
     return render_template(
         "index.html",
         accounts=accounts,
-        messages=messages,
+        conversations=conversations,
         login_url=LOGIN_URL,
     )
 
 
 @app.get("/api/messages")
 def get_messages():
-    return jsonify([message.__dict__ for message in fetch_messages()])
+    account_id = request.args.get("account_id", type=int)
+    etag = fetch_messages_etag(account_id)
+    if request.if_none_match.contains(etag):
+        # 304 trägt dieselben Validator- und Cache-Header wie die volle Antwort.
+        response = app.response_class(status=304)
+    elif account_id is None:
+        response = app.response_class(
+            fetch_messages_json(etag), mimetype="application/json"
+        )
+    else:
+        # Einzelne Chats kommen per Index-Suche, sie werden nicht gecacht.
+        response = app.response_class(
+            orjson.dumps(fetch_messages_raw(account_id)), mimetype="application/json"
+        )
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, max-age=2"
+    return response
 
 
 @app.post("/api/messages")
@@ -485,8 +982,9 @@ def post_message():
             ),
         )
         connection.commit()
+    invalidate_messages()
 
-    return jsonify(message.__dict__), 201
+    return jsonify(message), 201
 
 
 @app.post("/api/login")
@@ -500,7 +998,7 @@ def login_account():
         return jsonify({"error": "E-Mail und Passwort sind erforderlich."}), 400
 
     job_id = create_login_job(email=email, password=password, proxy=proxy)
-    start_login_thread(job_id)
+    submit_login(job_id)
     return jsonify({"status": "started", "job_id": job_id})
 
 
@@ -522,7 +1020,11 @@ def get_login_job(job_id: int):
     )
 
 
-init_db()
+@app.cli.command("init-db")
+def init_db_command() -> None:
+    """Legt das Datenbankschema an bzw. migriert eine ältere Datenbank."""
+    init_db()
+
 
 if __name__ == "__main__":
     app.run(debug=True)
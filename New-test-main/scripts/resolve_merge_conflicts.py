@@ -2,45 +2,63 @@
 from __future__ import annotations
 
 import argparse
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Iterator, Optional
 
-CONFLICT_START = "<<<<<<<"
-CONFLICT_MID = "======="
-CONFLICT_END = ">>>>>>>"
-
-
-def resolve_conflicts(content: str, keep: str) -> tuple[str, bool]:
-    lines = content.splitlines(keepends=True)
-    output: list[str] = []
-    index = 0
-    changed = False
-
-    while index < len(lines):
-        line = lines[index]
-        if line.startswith(CONFLICT_START):
-            changed = True
-            index += 1
-            ours: list[str] = []
-            theirs: list[str] = []
-            while index < len(lines) and not lines[index].startswith(CONFLICT_MID):
-                ours.append(lines[index])
-                index += 1
-            if index < len(lines) and lines[index].startswith(CONFLICT_MID):
-                index += 1
-            while index < len(lines) and not lines[index].startswith(CONFLICT_END):
-                theirs.append(lines[index])
-                index += 1
-            while index < len(lines) and not lines[index].startswith(CONFLICT_END):
-                index += 1
-            if index < len(lines) and lines[index].startswith(CONFLICT_END):
-                index += 1
-            output.extend(ours if keep == "ours" else theirs)
-            continue
-
-        output.append(line)
-        index += 1
-
-    return "".join(output), changed
+CONFLICT_START = b"<<<<<<<"
+
+# One conflict region: the marker lines must start a line, like git writes them.
+# Each side keeps its own line endings; an empty side matches as well.
+CONFLICT_RE = re.compile(
+    rb"^<<<<<<<[^\n]*\n(.*?)^=======[^\n]*\n(.*?)^>>>>>>>[^\n]*(?:\n|\Z)",
+    re.MULTILINE | re.DOTALL,
+)
+# A start marker that CONFLICT_RE could not match (no "=======" or ">>>>>>>").
+LEFTOVER_RE = re.compile(rb"^<<<<<<<", re.MULTILINE)
+
+SKIP_DIRS = {".git", "node_modules", "__pycache__", ".venv", "venv"}
+BINARY_SUFFIXES = {
+    ".png", ".jpg", ".jpeg", ".gif", ".ico", ".webp", ".pdf", ".zip", ".gz",
+    ".tar", ".woff", ".woff2", ".ttf", ".otf", ".pyc", ".so", ".db", ".sqlite3",
+}
+
+
+def resolve_conflicts(content: bytes, keep: str) -> tuple[bytes, bool]:
+    side = 1 if keep == "ours" else 2
+    updated, count = CONFLICT_RE.subn(lambda match: match.group(side), content)
+    return updated, count > 0
+
+
+def iter_files(root: Path) -> Iterator[Path]:
+    if root.is_file():
+        yield root
+        return
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if name not in SKIP_DIRS]
+        for name in filenames:
+            path = Path(directory, name)
+            # is_file() follows symlinks: drops dangling links, FIFOs and sockets.
+            if path.suffix.lower() not in BINARY_SUFFIXES and path.is_file():
+                yield path
+
+
+def scan_file(path: Path, keep: str) -> tuple[Optional[bytes], bool]:
+    """
+    Returns the resolved content (None if nothing could be resolved) and whether
+    malformed conflict markers are left that need fixing by hand.
+    """
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None, False
+    # Most files have no markers at all; NUL bytes mean a binary file.
+    if CONFLICT_START not in data or b"\0" in data:
+        return None, False
+    updated, changed = resolve_conflicts(data, keep)
+    return (updated if changed else None), bool(LEFTOVER_RE.search(updated))
 
 
 def main() -> None:
@@ -66,25 +84,27 @@ def main() -> None:
     )
     args = parser.parse_args()
 
-    root = Path(args.path)
-    paths = [root] if root.is_file() else [p for p in root.rglob("*") if p.is_file()]
+    paths = list(iter_files(Path(args.path)))
     conflicts_found = False
+    unresolved_found = False
 
-    for path in paths:
-        try:
-            content = path.read_text(encoding="utf-8")
-        except UnicodeDecodeError:
-            continue
-        updated, changed = resolve_conflicts(content, args.keep)
-        if changed:
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = executor.map(lambda path: scan_file(path, args.keep), paths)
+        for path, (updated, unresolved) in zip(paths, results):
+            if updated is None and not unresolved:
+                continue
             conflicts_found = True
-            if args.apply:
-                path.write_text(updated, encoding="utf-8")
-                print(f"Resolved conflicts in {path}")
-            else:
+            if not args.apply:
                 print(f"Conflict markers found in {path}")
+                continue
+            if updated is not None:
+                path.write_bytes(updated)
+                print(f"Resolved conflicts in {path}")
+            if unresolved:
+                unresolved_found = True
+                print(f"Unresolved conflict markers left in {path}")
 
-    if conflicts_found and not args.apply:
+    if unresolved_found or (conflicts_found and not args.apply):
         raise SystemExit(1)
 
 
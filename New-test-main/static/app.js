@@ -128,3 +128,59 @@ if (loginForm) {
     startLoginPolling(data.job_id);
   });
 }
+
+const chatList = document.getElementById("chat-list");
+const chatWindow = document.getElementById("chat-window");
+let selectedAccount = null;
+
+const renderConversation = (messages) => {
+  chatWindow.replaceChildren();
+  if (messages.length === 0) {
+    const empty = document.createElement("p");
+    empty.className = "muted";
+    empty.textContent = "Noch keine Nachrichten vorhanden.";
+    chatWindow.append(empty);
+    return;
+  }
+  messages.forEach((message) => {
+    const bubble = document.createElement("div");
+    bubble.className = `bubble ${message.sender === "Firma" ? "out" : "in"}`;
+    const text = document.createElement("p");
+    text.textContent = message.text;
+    const meta = document.createElement("span");
+    meta.textContent = `${message.timestamp} · ${message.sender}`;
+    bubble.append(text, meta);
+    chatWindow.append(bubble);
+  });
+};
+
+const loadConversation = async (accountId) => {
+  const response = await fetch(`/api/messages?account_id=${encodeURIComponent(accountId)}`);
+  // Antwort verwerfen, wenn inzwischen ein anderer Chat gewählt wurde.
+  if (!response.ok || accountId !== selectedAccount) {
+    return;
+  }
+  renderConversation(await response.json());
+};
+
+if (chatList && chatWindow) {
+  chatList.addEventListener("click", (event) => {
+    const item = event.target.closest(".chat-item");
+    if (!item) {
+      return;
+    }
+    chatList.querySelectorAll(".chat-item.active").forEach((element) => {
+      element.classList.remove("active");
+    });
+    item.classList.add("active");
+    selectedAccount = item.dataset.account;
+    loadConversation(selectedAccount);
+  });
+
+  // Nur die gewählte Unterhaltung nachladen; unverändert → 304 über das ETag.
+  window.setInterval(() => {
+    if (selectedAccount) {
+      loadConversation(selectedAccount);
+    }
+  }, 60000);
+}